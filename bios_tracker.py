@@ -1,23 +1,45 @@
+import argparse
+import asyncio
 import json
 import os
 import yaml
 import datetime
+import functools
+import hashlib
 import html
-import time
+import inspect
 import sys
 import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Protocol
 from zoneinfo import ZoneInfo
 
+import requests
+import requests_cache
+
+# orjson (optional) reads and writes data.json several times faster than stdlib json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_FORM_EMBED = "https://docs.google.com/forms/d/e/1FAIpQLSeeu3yf7GYgZbPWPLX_iDzg_ulEfe7FdgiW66Co3QHUKaG7Cw/viewform?embedded=true"
 DEFAULT_SHEET_ID   = "1O6A9AI0wMu5vWrtKgvwFAxJFEGu6aznUal2khv_oukI"
 DEFAULT_GID        = "1502059609"
 
+# Site timezone for "Last updated" and the 5-day freshness window.
+_TZ = ZoneInfo("America/Chicago")
+
 # -------------------------------------------------------------------
 # Vendor scrapers (your existing modules)
 # Each module must expose: latest_two(model_name, override_url=None) -> dict
+# Optional: latest_many(items) for batch runs, and a `session=` keyword on
+# either to reuse the shared requests.Session below.
 # -------------------------------------------------------------------
 from vendors import asus, msi, gigabyte
+from vendors._http import TokenBucket, env_number, mount_adapter
 
 VENDOR_MODULES = {
     "asus": asus,
@@ -25,41 +47,86 @@ VENDOR_MODULES = {
     "gigabyte": gigabyte,
 }
 
-VENDOR_FUNCS = {
-    "asus": asus.latest_two,
-    "msi": msi.latest_two,
-    "gigabyte": gigabyte.latest_two,
+# Dispatch tables, all derived from VENDOR_MODULES so a new vendor is one entry
+VENDOR_FUNCS = {vkey: module.latest_two for vkey, module in VENDOR_MODULES.items()}
+VENDOR_BATCH_FUNCS = {
+    vkey: module.latest_many
+    for vkey, module in VENDOR_MODULES.items()
+    if callable(getattr(module, "latest_many", None))
 }
 
+def _accepts_kwarg(func, name: str) -> bool:
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in params or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+
+# Resolved once at import rather than retrying every board on TypeError.
+_ACCEPTS_URL = {vkey: _accepts_kwarg(func, "override_url") for vkey, func in VENDOR_FUNCS.items()}
+_ACCEPTS_SESSION = {vkey: _accepts_kwarg(func, "session") for vkey, func in VENDOR_FUNCS.items()}
+_BATCH_ACCEPTS_SESSION = {vkey: _accepts_kwarg(func, "session") for vkey, func in VENDOR_BATCH_FUNCS.items()}
+
+# -------------------------------------------------------------------
+# Shared HTTP session, built once per run in main(): keep-alive connections
+# are reused across boards for any vendor that accepts `session=`. Responses
+# are cached on disk and revalidated with ETag/Last-Modified, so unchanged
+# pages come back as 304s.
+# -------------------------------------------------------------------
+HTTP_CACHE_PATH = Path("cache/http_cache.sqlite")
+
+# Seconds a cached response stays fresh; override with BIOS_CACHE_TTL.
+HTTP_CACHE_TTL = env_number("BIOS_CACHE_TTL", 3600, int)
+
+def _new_session() -> requests.Session:
+    session = requests_cache.CachedSession(
+        str(HTTP_CACHE_PATH),
+        backend="sqlite",
+        cache_control=True,
+        expire_after=HTTP_CACHE_TTL,
+    )
+    # Sweep stale entries once per run so the cache file doesn't grow forever.
+    try:
+        session.cache.delete(expired=True)
+    except Exception as e:
+        print(f"Could not sweep expired HTTP cache entries: {e}", file=sys.stderr)
+    return mount_adapter(session)
+
 # -------------------------------------------------------------------
 # Config
 # -------------------------------------------------------------------
+# libyaml's C loader when PyYAML was built with it; same safe semantics either way.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_config():
-    with open("config.yml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return yaml.load(Path("config.yml").read_bytes(), Loader=_YAML_LOADER) or {}
 
 # -------------------------------------------------------------------
 # Helpers: Beta label, date parsing, highlight (fresh within 5 days)
 # -------------------------------------------------------------------
 _BETA_PARENS = re.compile(r"\(\s*beta\s+version\s*\)", re.I)
 _BETA_BARE   = re.compile(r"\b(beta(?:\s+version)?)\b", re.I)
+_MULTI_WS    = re.compile(r"\s{2,}")
 
 def normalize_beta(version: str | None) -> str | None:
     """Normalize any vendor's 'beta version' to '... (Beta)'."""
-    if not version:
+    # Most versions carry no beta marker at all: skip the regex passes.
+    if not version or "beta" not in version.lower():
         return version
     v = _BETA_PARENS.sub("(Beta)", version)
-    if "(Beta)" not in v and re.search(_BETA_BARE, v):
-        v = _BETA_BARE.sub("", v).strip()
-        v = re.sub(r"\s{2,}", " ", v).strip()
+    if "(Beta)" not in v and _BETA_BARE.search(v):
+        v = _MULTI_WS.sub(" ", _BETA_BARE.sub("", v).strip()).strip()
         v = f"{v} (Beta)"
     return v
 
+_DATE_TRANS = str.maketrans({"/": "-", ".": "-"})
+
+@functools.lru_cache(maxsize=1024)
 def _parse_date(date_str: str | None) -> datetime.date | None:
-    """Parse YYYY-MM-DD or YYYY/MM/DD or YYYY.MM.DD to a date()."""
+    """Parse YYYY-MM-DD or YYYY/MM/DD or YYYY.MM.DD to a date() (memoized: boards share few dates)."""
     if not date_str:
         return None
-    s = str(date_str).strip().replace("/", "-").replace(".", "-")
+    s = str(date_str).strip().translate(_DATE_TRANS)
     try:
         y, m, d = (int(x) for x in s.split("-"))
         return datetime.date(y, m, d)
@@ -72,34 +139,48 @@ def _is_fresh_release(date_str: str | None, today: datetime.date | None = None)
     if not d:
         return False
     if today is None:
-        today = datetime.datetime.now(ZoneInfo("America/Chicago")).date()
+        today = datetime.datetime.now(_TZ).date()
     delta = (today - d).days
     return 0 <= delta <= 5
 
 # -------------------------------------------------------------------
 # Card rows & rendering
 # -------------------------------------------------------------------
-def _row(label: str, version: str | None, date: str | None):
-    """One key/value row: label, version, date right-aligned."""
-    v_txt = normalize_beta(version)
-    v_html = html.escape(v_txt or "-")
-    d_html = html.escape(date) if date else ""
-    return (
-        '<div class="kv">'
-        f'  <span class="k">{html.escape(label)}</span>'
-        f'  <span class="v">{v_html}</span>'
-        f'  <span class="date">{d_html}</span>'
-        '</div>'
-    )
-
-def build_card(entry, today: datetime.date | None = None):
-    vendor = entry.get("vendor", "")
-    model = entry.get("model", "")
-    url = entry.get("url", "#")
-    ok = entry.get("ok", False)
-    vlist = entry.get("versions", [])[:2]
-    err = entry.get("error")
-    is_stale = bool(entry.get("stale"))
+_ROW_WITH_DATE = '<div class="kv"><span class="k">%s</span><span class="v">%s</span><span class="date">%s</span></div>'
+_ROW_NO_DATE   = '<div class="kv"><span class="k">%s</span><span class="v">%s</span></div>'
+_LABEL_CURRENT_ESC  = html.escape("Current")
+_LABEL_PREVIOUS_ESC = html.escape("Previous")
+
+def _row(label_esc: str, version: str | None, date: str | None):
+    """One key/value row: pre-escaped label, version, date right-aligned (omitted when unknown)."""
+    v_html = html.escape(normalize_beta(version) or "-")
+    if date:
+        return _ROW_WITH_DATE % (label_esc, v_html, html.escape(date))
+    return _ROW_NO_DATE % (label_esc, v_html)
+
+# Only a handful of vendor names exist, so their escaped forms are cached.
+_VENDOR_ESC_CACHE: dict[str, str] = {}
+
+def _esc_vendor(vendor: str) -> str:
+    esc = _VENDOR_ESC_CACHE.get(vendor)
+    if esc is None:
+        esc = _VENDOR_ESC_CACHE[vendor] = html.escape(vendor)
+    return esc
+
+class _TextSink(Protocol):
+    """Anything cards can be written to: a text file, StringIO or _HashingWriter."""
+    def write(self, s: str) -> int: ...
+
+def build_card(entry, out: _TextSink, today: datetime.date | None = None):
+    """Write one card's HTML to `out` (shared across cards, so no per-card join)."""
+    g = entry.get
+    vendor = g("vendor", "")
+    model = g("model", "")
+    url = g("url", "#")
+    ok = g("ok", False)
+    vlist = (g("versions") or ())[:2]
+    err = g("error")
+    is_stale = bool(g("stale"))
 
     # Highlight classes
     current_date_str = vlist[0].get("date") if vlist else None
@@ -111,40 +192,38 @@ def build_card(entry, today: datetime.date | None = None):
     elif is_fresh:
         classes.append("card--fresh")
 
-    parts = []
-    parts.append(f'<div class="{" ".join(classes)}" data-vendor="{html.escape(vendor)}">')
-    parts.append(f'  <h3>{html.escape(model)} <span class="badge">{html.escape(vendor)}</span></h3>')
+    vendor_esc = _esc_vendor(vendor)
+    w = out.write
+    w(f'<div class="{" ".join(classes)}" data-vendor="{vendor_esc}">\n')
+    w(f'  <h3>{html.escape(model)} <span class="badge">{vendor_esc}</span></h3>\n')
     if url:
-        parts.append(f'  <div class="meta"><a href="{html.escape(url)}" target="_blank" rel="noreferrer">Vendor page</a></div>')
+        w(f'  <div class="meta"><a href="{html.escape(url)}" target="_blank" rel="noreferrer">Vendor page</a></div>\n')
 
     if vlist:
-        cur_v = vlist[0].get("version") if len(vlist) >= 1 else None
-        cur_d = vlist[0].get("date") if len(vlist) >= 1 else None
-        parts.append(_row("Current", cur_v, cur_d))
-        if len(vlist) >= 2:
-            prev_v = vlist[1].get("version")
-            prev_d = vlist[1].get("date")
-            parts.append(_row("Previous", prev_v, prev_d))
+        cur = vlist[0]
+        w(_row(_LABEL_CURRENT_ESC, cur.get("version"), cur.get("date")))
+        if len(vlist) == 2:
+            prev = vlist[1]
+            w(_row(_LABEL_PREVIOUS_ESC, prev.get("version"), prev.get("date")))
         if is_stale:
             detail = ""
-            if entry.get("last_success_at"):
-                detail = f' <span>Last good check: {html.escape(str(entry.get("last_success_at")))}</span>'
-            parts.append(f'  <div class="warning">{html.escape(_friendly_error(err, stale=True))}{detail}</div>')
-            parts.append(_error_details_html(err))
+            last_success_at = g("last_success_at")
+            if last_success_at:
+                detail = f' <span>Last good check: {html.escape(str(last_success_at))}</span>'
+            w(f'  <div class="warning">{html.escape(_friendly_error(err, stale=True))}{detail}</div>\n')
+            w(_error_details_html(err) + "\n")
     else:
-        parts.append(f'  <div class="error">{html.escape(_friendly_error(err))}</div>')
-        parts.append(_error_details_html(err))
+        w(f'  <div class="error">{html.escape(_friendly_error(err))}</div>\n')
+        w(_error_details_html(err) + "\n")
+
+    w('</div>\n')
 
-    parts.append('</div>')
-    return "\n".join(parts)
-    
 def _sort_results_newest_first(results: list[dict]) -> list[dict]:
-    """Sort tiles by the 'Current' version release date (newest first)."""
+    """Sort tiles by the 'Current' version release date (newest first, undated last)."""
     def key(res):
         versions = res.get("versions") or []
-        cur_date_str = versions[0].get("date") if versions else None
-        d = _parse_date(cur_date_str)
-        return (0, -(d.toordinal())) if d else (1, 0)
+        d = _parse_date(versions[0].get("date") if versions else None)
+        return (0, -d.toordinal()) if d else (1, 0)
     return sorted(results, key=key)
 
 def _escape_multiline(s: str) -> str:
@@ -152,13 +231,95 @@ def _escape_multiline(s: str) -> str:
         return ""
     return "<br>".join(html.escape(s).splitlines())
 
+_WS_RUN = re.compile(r"\s+")
+
 def _board_key(vendor: str | None, model: str | None) -> tuple[str, str]:
-    model_key = re.sub(r"\s+", " ", str(model or "").strip()).casefold()
+    model_key = _WS_RUN.sub(" ", str(model or "").strip()).casefold()
     return str(vendor or "").strip().upper(), model_key
 
-def _load_previous_results(data_path: Path) -> dict[tuple[str, str], dict]:
+def _dump_results(results: list[dict], pretty: bool = False) -> bytes:
+    """Serialize results for data.json: compact by default, indented with `pretty`."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(results, option=option)
+    # ensure_ascii=False writes raw UTF-8 like orjson, so the bytes (and the
+    # data.json fingerprint) don't depend on which serializer is installed
+    if pretty:
+        return (json.dumps(results, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    return (json.dumps(results, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+# -------------------------------------------------------------------
+# Write-if-changed: fingerprints ignore the per-run timestamps, so a run
+# that only moved "Last updated" leaves docs/ untouched. The real per-board
+# last_success_at is kept in cache/ (not committed or published), since
+# data.json's copy only moves when its content does. Setting
+# BIOS_HEARTBEAT_HOURS republishes an unchanged page after that many hours
+# so "Last updated" shows the tracker is alive; off by default.
+# -------------------------------------------------------------------
+_VOLATILE_KEYS = ("checked_at", "last_success_at")
+LAST_SUCCESS_PATH = Path("cache/last_success.json")
+PAGE_HEARTBEAT_HOURS = env_number("BIOS_HEARTBEAT_HOURS", 0.0)
+
+class _HashingWriter:
+    """File-like wrapper that hashes everything written through it."""
+    def __init__(self, f):
+        self._f = f
+        self.digest = hashlib.sha256()
+
+    def write(self, s: str) -> int:
+        self.digest.update(s.encode("utf-8"))
+        return self._f.write(s)
+
+    def write_unhashed(self, s: str, stand_in: str) -> int:
+        """Write `s` but hash `stand_in`, for parts that change every run."""
+        self.digest.update(stand_in.encode("utf-8"))
+        return self._f.write(s)
+
+def _data_fingerprint(results: list[dict], pretty: bool = False) -> str:
+    stable = [{k: v for k, v in r.items() if k not in _VOLATILE_KEYS} for r in results]
+    return hashlib.sha256(_dump_results(stable, pretty=pretty)).hexdigest()
+
+def _write_atomic(path: Path, data: bytes):
+    """Write via a sibling temp file + os.replace, so readers never see a half-written file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _load_fingerprints(path: Path) -> dict[str, str]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    return dict(line.split(" ", 1) for line in lines if " " in line)
+
+def _save_fingerprints(path: Path, prints: dict[str, str]):
+    _write_atomic(path, "".join(f"{name} {digest}\n" for name, digest in sorted(prints.items())).encode("utf-8"))
+
+def _last_success_key(vendor: str | None, model: str | None) -> str:
+    return "|".join(_board_key(vendor, model))
+
+def _load_last_success(path: Path) -> dict[str, str]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+def _save_last_success(path: Path, results: list[dict]):
+    stamps = {
+        _last_success_key(r.get("vendor"), r.get("model")): r["last_success_at"]
+        for r in results
+        if r.get("last_success_at")
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, (json.dumps(stamps, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+
+def _load_previous_results(data_path: Path, last_success: dict[str, str] | None = None) -> dict[tuple[str, str], dict]:
     try:
-        raw = json.loads(data_path.read_text(encoding="utf-8"))
+        payload = data_path.read_bytes()
+        raw = orjson.loads(payload) if orjson is not None else json.loads(payload)
     except Exception:
         return {}
 
@@ -173,6 +334,10 @@ def _load_previous_results(data_path: Path) -> dict[tuple[str, str], dict]:
     for entry in entries:
         if not isinstance(entry, dict) or not entry.get("versions"):
             continue
+        stamp = (last_success or {}).get(_last_success_key(entry.get("vendor"), entry.get("model")))
+        if stamp:
+            # data.json may predate the last good check; cache/ stamps don't
+            entry = {**entry, "last_success_at": stamp}
         previous[_board_key(entry.get("vendor"), entry.get("model"))] = entry
     return previous
 
@@ -290,6 +455,81 @@ def _append_github_summary(results: list[dict], updated_at: str):
     except Exception as e:
         print(f"Could not write GitHub summary: {e}", file=sys.stderr)
     
+# -------------------------------------------------------------------
+# Scraping: vendors run concurrently, boards per each module's MAX_CONCURRENT
+# -------------------------------------------------------------------
+def _normalize_model(item):
+    if isinstance(item, dict):
+        return item.get("name") or item.get("model") or "", item.get("url")
+    return str(item), None
+
+def _scrape_board(vkey: str, func, bucket: TokenBucket, session: requests.Session, item: dict) -> dict:
+    """One per-board vendor call; errors become a failed result."""
+    vendor_key = vkey.lower()
+    model = item["model"]
+    override_url = item.get("url")
+    print(f"[{vkey}] {model} ...", file=sys.stderr)
+    bucket.acquire()
+    kwargs = {"override_url": override_url} if _ACCEPTS_URL.get(vendor_key) else {}
+    if _ACCEPTS_SESSION.get(vendor_key):
+        kwargs["session"] = session
+    try:
+        return func(model, **kwargs)
+    except Exception as e:
+        return {
+            "vendor": vkey.upper(),
+            "model": model,
+            "url": override_url or "",
+            "versions": [],
+            "ok": False,
+            "error": str(e),
+        }
+
+def _scrape_vendor(vkey: str, models, bucket: TokenBucket, session: requests.Session) -> list[dict]:
+    """Scrape one vendor's boards: batch API first, per-board calls as fallback."""
+    vendor_key = vkey.lower()
+    func = VENDOR_FUNCS.get(vendor_key)
+    if not func:
+        print(f"Unknown vendor key: {vkey}", file=sys.stderr)
+        return []
+
+    normalized_items = []
+    for item in (models or []):
+        model, override_url = _normalize_model(item)
+        if model:
+            normalized_items.append({"model": model, "url": override_url})
+
+    module = VENDOR_MODULES.get(vendor_key)
+    batch_func = VENDOR_BATCH_FUNCS.get(vendor_key)
+    if batch_func and normalized_items:
+        for item in normalized_items:
+            print(f"[{vkey}] {item['model']} ...", file=sys.stderr)
+        batch_kwargs = {"session": session} if _BATCH_ACCEPTS_SESSION.get(vendor_key) else {}
+        try:
+            return list(batch_func(normalized_items, **batch_kwargs))
+        except Exception as e:
+            print(f"[{vkey}] batch scrape failed, falling back: {e}", file=sys.stderr)
+
+    # Per-board fallback: up to the module's MAX_CONCURRENT boards at once,
+    # still paced by the vendor's token bucket; map() keeps config order.
+    workers = max(1, int(getattr(module, "MAX_CONCURRENT", 1) or 1))
+    fetch = functools.partial(_scrape_board, vkey, func, bucket, session)
+    if workers == 1 or len(normalized_items) < 2:
+        return [fetch(item) for item in normalized_items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=vendor_key) as ex:
+        return list(ex.map(fetch, normalized_items))
+
+async def _scrape_all(vendors: dict, session: requests.Session) -> list[dict]:
+    """Scrape every vendor at once, each in a worker thread (the scrapers are sync)."""
+    # One bucket per vendor, so vendors never wait on each other's pacing.
+    buckets: dict[str, TokenBucket] = {}
+    jobs = [
+        asyncio.to_thread(_scrape_vendor, vkey, models, buckets.setdefault(vkey.lower(), TokenBucket()), session)
+        for vkey, models in vendors.items()
+    ]
+    per_vendor = await asyncio.gather(*jobs)
+    return [res for vendor_results in per_vendor for res in vendor_results]
+
 # -------------------------------------------------------------------
 # Google Form / Sheet comments (Type, Website, Details)
 # -------------------------------------------------------------------
@@ -300,30 +540,21 @@ def _get_google_comments_cfg(cfg: dict):
     gid  = c.get("gid")        or DEFAULT_GID
     return form, sid, gid
 
-def _google_comments_block(cfg: dict) -> str:
-    """One button opens the form; render recent submissions (Type, Website, Details) with robust fetch + errors."""
-    form_embed, sheet_id, gid = _get_google_comments_cfg(cfg)
-
-    # If placeholders still present, show setup banner
-    if "REPLACE_" in form_embed or "REPLACE_" in sheet_id or "REPLACE_" in gid:
-        return """
+# Shown until the Form / Sheet constants above are configured.
+_COMMENTS_SETUP_HTML = """
 <section class="comments">
   <h2>Report a board</h2>
   <p class="hint">Owner setup required: configure the 3 constants at the top of <code>bios_tracker.py</code>: <code>DEFAULT_FORM_EMBED</code>, <code>DEFAULT_SHEET_ID</code>, <code>DEFAULT_GID</code>.</p>
 </section>
 """
 
-    from html import escape as esc
-    form_plain = form_embed.replace("/viewform?embedded=true", "/viewform")
-    gviz = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:json&gid={gid}"
-    csv  = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-
-    return f"""
+# Compiled once at import; JS braces stay literal, "$$" escapes a JS "$".
+_COMMENTS_TEMPLATE = string.Template("""
 <section class="comments">
   <h2>Report a board</h2>
 
   <div class="comments__toolbar">
-    <a class="button" href="{esc(form_plain)}" target="_blank" rel="noreferrer">
+    <a class="button" href="$form_plain" target="_blank" rel="noreferrer">
       Report Problem
     </a>
   </div>
@@ -332,244 +563,143 @@ def _google_comments_block(cfg: dict) -> str:
   <div id="comments-list" class="comment-list">Loading…</div>
 
   <script>
-  (function() {{
+  (function() {
     const LIST = document.getElementById('comments-list');
-    const GVIZ = {gviz!r};
-    const CSV  = {csv!r};
+    const GVIZ = $gviz;
+    const CSV  = $csv;
 
-    function esc(s) {{ return String(s||'').replace(/[&<>"]/g, c => ({{'&':'&amp;','<':'&lt;','>':'&gt;'}})[c] || c); }}
-    function pick(obj, keys) {{ const o={{}}; keys.forEach(k=>o[k]=obj[k]??''); return o; }}
+    function esc(s) { return String(s||'').replace(/[&<>"]/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;'})[c] || c); }
+    function pick(obj, keys) { const o={}; keys.forEach(k=>o[k]=obj[k]??''); return o; }
 
-    async function load() {{
-      try {{
+    async function load() {
+      try {
         const items = await fetchGviz();
         render(items);
-      }} catch (e1) {{
+      } catch (e1) {
         console.warn('GViz failed, trying CSV…', e1);
-        try {{
+        try {
           const items = await fetchCsv();
           render(items);
-        }} catch (e2) {{
+        } catch (e2) {
           console.error('CSV failed', e2);
           LIST.innerHTML = '<div class="comment">Failed to load entries.<br><small>'
             + esc(String(e1).slice(0,200)) + '</small></div>';
-        }}
-      }}
-    }}
+        }
+      }
+    }
 
-    async function fetchGviz() {{
-      const res = await fetch(GVIZ, {{ headers: {{ 'Accept':'text/plain' }} }});
+    async function fetchGviz() {
+      const res = await fetch(GVIZ, { headers: { 'Accept':'text/plain' } });
       if (!res.ok) throw new Error('GViz HTTP ' + res.status);
       const text = await res.text();
-      const start = text.indexOf('{{'); const end = text.lastIndexOf('}}');
+      const start = text.indexOf('{'); const end = text.lastIndexOf('}');
       if (start < 0 || end < 0) throw new Error('GViz: unexpected response (no JSON found)');
       const json = JSON.parse(text.slice(start, end+2));
-      const table = json.table || {{}}; const cols = (table.cols||[]).map(c => c.label || c.id);
-      const rows = (table.rows||[]).map(r => {{
-        const o = {{}}; (r.c||[]).forEach((cell,i)=>o[cols[i] || ('c'+i)] = cell ? cell.v : ''); return o;
-      }});
+      const table = json.table || {}; const cols = (table.cols||[]).map(c => c.label || c.id);
+      const rows = (table.rows||[]).map(r => {
+        const o = {}; (r.c||[]).forEach((cell,i)=>o[cols[i] || ('c'+i)] = cell ? cell.v : ''); return o;
+      });
       const name = n => cols.find(h => (h||'').toLowerCase() === n) || '';
-      const H = {{
+      const H = {
         ts:   name('timestamp') || cols[0] || 'Timestamp',
         type: name('type')      || 'Type',
         site: name('website')   || 'Website',
         det:  name('details')   || 'Details'
-      }};
-      const items = rows.map(r => pick(r, [H.ts,H.type,H.site,H.det])).map(r => ({{
+      };
+      const items = rows.map(r => pick(r, [H.ts,H.type,H.site,H.det])).map(r => ({
         ts: r[H.ts], type: r[H.type], website: r[H.site], details: r[H.det]
-      }})).sort((a,b)=> new Date(b.ts||0)-new Date(a.ts||0));
+      })).sort((a,b)=> new Date(b.ts||0)-new Date(a.ts||0));
       return items;
-    }}
+    }
 
-    async function fetchCsv() {{
+    async function fetchCsv() {
       const res = await fetch(CSV);
       if (!res.ok) throw new Error('CSV HTTP ' + res.status);
       const text = await res.text();
       const lines = text.split(/\\r?\\n/).filter(Boolean);
       if (!lines.length) return [];
-      const headers = lines.shift().split(',').map(h => h.trim().replace(/^"|"$/g,''));
+      const headers = lines.shift().split(',').map(h => h.trim().replace(/^"|"$$/g,''));
       const idx = (want) => headers.findIndex(h => h.toLowerCase() === want);
       const iTs = idx('timestamp'), iType = idx('type'), iSite = idx('website'), iDet = idx('details');
 
-      function parseRow(line){{
+      function parseRow(line){
         const cells = parseCsvLine(line);
-        return {{
+        return {
           ts:   cells[iTs]   ?? '',
           type: cells[iType] ?? '',
           website: cells[iSite] ?? '',
           details: cells[iDet] ?? ''
-        }};
-      }}
+        };
+      }
 
       const items = lines.map(parseRow)
         .filter(x => x.ts || x.details || x.type || x.website)
         .sort((a,b)=> new Date(b.ts||0)-new Date(a.ts||0));
       return items;
-    }}
+    }
 
-    function parseCsvLine(line){{
+    function parseCsvLine(line){
       const out = []; let cur = ''; let quote = false;
-      for (let i=0;i<line.length;i++) {{
+      for (let i=0;i<line.length;i++) {
         const ch = line[i];
-        if (quote) {{
-          if (ch === '"') {{
-            if (line[i+1] === '"') {{ cur += '"'; i++; }} else {{ quote = false; }}
-          }} else cur += ch;
-        }} else {{
-          if (ch === ',') {{ out.push(cur); cur=''; }}
+        if (quote) {
+          if (ch === '"') {
+            if (line[i+1] === '"') { cur += '"'; i++; } else { quote = false; }
+          } else cur += ch;
+        } else {
+          if (ch === ',') { out.push(cur); cur=''; }
           else if (ch === '"') quote = true;
           else cur += ch;
-        }}
-      }}
+        }
+      }
       out.push(cur);
       return out.map(s => s.trim());
-    }}
+    }
 
-    function render(items){{
-      if (!items.length) {{
+    function render(items){
+      if (!items.length) {
         LIST.innerHTML = '<div class="comment">No entries yet.</div>';
         return;
-      }}
+      }
       LIST.innerHTML = items.map(it => `
         <article class="comment">
           <div class="meta">
-            <strong>[${{esc(it.type)}}]</strong>
-            <span>${{esc(it.website)}}</span>
-            <span>${{esc(it.ts)}}</span>
+            <strong>[$${esc(it.type)}]</strong>
+            <span>$${esc(it.website)}</span>
+            <span>$${esc(it.ts)}</span>
           </div>
-          <div class="body">${{esc(it.details)}}</div>
+          <div class="body">$${esc(it.details)}</div>
         </article>
       `).join('');
-    }}
+    }
 
     load();
-  }})();
+  })();
   </script>
 </section>
-"""
-
-
-# -------------------------------------------------------------------
-# Main
-# -------------------------------------------------------------------
-def main():
-    cfg = load_config()
-    vendors = (cfg.get("vendors") or {})
+""")
 
-    # Optional notes
-    notes_text = (cfg.get("notes") or "").strip()
-
-    docs = Path("docs")
-    data_path = docs / "data.json"
-    previous_results = _load_previous_results(data_path)
-
-    results: list[dict] = []
-
-    def normalize_model(item):
-        if isinstance(item, dict):
-            return item.get("name") or item.get("model") or "", item.get("url")
-        return str(item), None
-
-    # Scrape vendors
-    for vkey, models in vendors.items():
-        vendor_key = vkey.lower()
-        func = VENDOR_FUNCS.get(vendor_key)
-        if not func:
-            print(f"Unknown vendor key: {vkey}", file=sys.stderr)
-            continue
-
-        normalized_items = []
-        for item in (models or []):
-            model, override_url = normalize_model(item)
-            if model:
-                normalized_items.append({"model": model, "url": override_url})
-
-        module = VENDOR_MODULES.get(vendor_key)
-        batch_func = getattr(module, "latest_many", None) if module else None
-        if callable(batch_func) and normalized_items:
-            for item in normalized_items:
-                print(f"[{vkey}] {item['model']} ...", file=sys.stderr)
-            try:
-                results.extend(batch_func(normalized_items))
-                continue
-            except Exception as e:
-                print(f"[{vkey}] batch scrape failed, falling back: {e}", file=sys.stderr)
-
-        for item in normalized_items:
-            model = item["model"]
-            override_url = item.get("url")
-            print(f"[{vkey}] {model} ...", file=sys.stderr)
-            try:
-                res = func(model, override_url=override_url)
-            except TypeError:
-                res = func(model)
-            except Exception as e:
-                res = {
-                    "vendor": vkey.upper(),
-                    "model": model,
-                    "url": override_url or "",
-                    "versions": [],
-                    "ok": False,
-                    "error": str(e),
-                }
-            results.append(res)
-            time.sleep(0.3)
-
-    now = datetime.datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d %H:%M %Z")
-    _apply_last_good_fallback(results, previous_results, now)
-
-    # Sort cards by current release date (newest first)
-    results = _sort_results_newest_first(results)
-
-    # Build cards
-    today = datetime.datetime.now(ZoneInfo("America/Chicago")).date()
-    cards_html = "\n".join(build_card(r, today=today) for r in results)
-
-    # Comments section (Google Form + Sheet)
-    comments_html = _google_comments_block(cfg)
+def _google_comments_block(cfg: dict) -> str:
+    """One button opens the form; render recent submissions (Type, Website, Details) with robust fetch + errors."""
+    form_embed, sheet_id, gid = _get_google_comments_cfg(cfg)
 
-    # Write docs
-    docs.mkdir(parents=True, exist_ok=True)
-    idx = docs / "index.html"
+    # If placeholders still present, show setup banner
+    if "REPLACE_" in form_embed or "REPLACE_" in sheet_id or "REPLACE_" in gid:
+        return _COMMENTS_SETUP_HTML
 
-    header_html = f"""
-<header class="page-header">
-  <h1>Motherboard BIOS Tracker</h1>
-  <div class="search">
-    <input type="search" id="search-input" placeholder="Search model…" aria-label="Search models" />
-  </div>
-  <div class="toolbar">
-    <button data-filter="all" class="active">All</button>
-    <button data-filter="ASUS">ASUS</button>
-    <button data-filter="MSI">MSI</button>
-    <button data-filter="GIGABYTE">GIGABYTE</button>
-  </div>
-</header>
-"""
+    from html import escape as esc
+    form_plain = form_embed.replace("/viewform?embedded=true", "/viewform")
+    gviz = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:json&gid={gid}"
+    csv  = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
 
-    # Status bar — timestamp left; legend centered via hidden clone
-    statusbar_html = f"""
-<div class="statusbar" role="note" aria-label="Legend and last updated">
-  <div class="last-updated">Last updated: {html.escape(now)}</div>
-  <div class="legend">
-    <span class="legend-item"><span class="swatch swatch--fresh"></span>New in last 5 days</span>
-    <span class="legend-item"><span class="swatch swatch--stale"></span>Showing last good result</span>
-  </div>
-  <div class="last-updated last-updated--clone" aria-hidden="true">Last updated: {html.escape(now)}</div>
-</div>
-"""
+    return _COMMENTS_TEMPLATE.substitute(form_plain=esc(form_plain), gviz=repr(gviz), csv=repr(csv))
 
-    # Optional notes
-    notes_html = ""
-    if notes_text:
-        notes_html = f"""
-<div class="notice" role="note" aria-label="Site notes">
-  <strong>Notes:</strong> {_escape_multiline(notes_text)}
-</div>
-"""
 
-    # Inline styles (keeps your page layout + comments)
-    inline_css = """
+# -------------------------------------------------------------------
+# Page templates (built once at import)
+# -------------------------------------------------------------------
+# Inline styles (keeps your page layout + comments)
+_INLINE_CSS = """
 <style>
 /* wider page */
 .container{max-width:1600px;margin:0 auto;padding:0 16px}
@@ -674,8 +804,36 @@ def main():
 </style>
 """
 
-    # Filter + search behavior
-    filter_js = """
+# Header — title | search | vendor filter
+_HEADER_HTML = """
+<header class="page-header">
+  <h1>Motherboard BIOS Tracker</h1>
+  <div class="search">
+    <input type="search" id="search-input" placeholder="Search model…" aria-label="Search models" />
+  </div>
+  <div class="toolbar">
+    <button data-filter="all" class="active">All</button>
+    <button data-filter="ASUS">ASUS</button>
+    <button data-filter="MSI">MSI</button>
+    <button data-filter="GIGABYTE">GIGABYTE</button>
+  </div>
+</header>
+"""
+
+# Status bar — timestamp left; legend centered via hidden clone
+_STATUSBAR_TEMPLATE = string.Template("""
+<div class="statusbar" role="note" aria-label="Legend and last updated">
+  <div class="last-updated">Last updated: $now</div>
+  <div class="legend">
+    <span class="legend-item"><span class="swatch swatch--fresh"></span>New in last 5 days</span>
+    <span class="legend-item"><span class="swatch swatch--stale"></span>Showing last good result</span>
+  </div>
+  <div class="last-updated last-updated--clone" aria-hidden="true">Last updated: $now</div>
+</div>
+""")
+
+# Filter + search behavior
+_FILTER_JS = """
 <script>
 document.addEventListener('DOMContentLoaded', () => {
   const buttons = document.querySelectorAll('.toolbar [data-filter]');
@@ -705,36 +863,142 @@ document.addEventListener('DOMContentLoaded', () => {
 </script>
 """
 
-    # Final page
-    page_html = f"""<!doctype html>
+
+def _stream_page(path: Path, results: list[dict], statusbar_html: str, notes_html: str,
+                 comments_html: str, today: datetime.date) -> str:
+    """Stream the page to `path`, cards written one by one; returns its fingerprint.
+
+    The status bar is hashed as a fixed stand-in, so the digest only moves
+    when the page differs beyond the "Last updated" timestamp.
+    """
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as raw:
+        f = _HashingWriter(raw)
+        w = f.write
+        w("""<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
   <title>BIOS Tracker</title>
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <link rel="stylesheet" href="assets/site.css?v=6">
-  {inline_css}
+  """)
+        w(_INLINE_CSS)
+        w("""
 </head>
 <body>
   <div class="container">
-    {header_html}
-    {statusbar_html}
-    {notes_html}
+    """)
+        w(_HEADER_HTML)
+        w("\n    ")
+        f.write_unhashed(statusbar_html, _STATUSBAR_TEMPLATE.substitute(now=""))
+        w("\n    ")
+        w(notes_html)
+        w("""
     <div class="grid">
-      {cards_html}
+      """)
+        for r in results:
+            build_card(r, f, today=today)
+        w("""
     </div>
-    {_google_comments_block(cfg)}
+    """)
+        w(comments_html)
+        w("""
   </div>
-  {filter_js}
+  """)
+        w(_FILTER_JS)
+        w("""
 </body>
 </html>
+""")
+    return f.digest.hexdigest()
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build the BIOS tracker page and data.json.")
+    parser.add_argument("--pretty", action="store_true", help="indent docs/data.json for humans")
+    args = parser.parse_args(argv)
+
+    cfg = load_config()
+    vendors = (cfg.get("vendors") or {})
+
+    # Optional notes
+    notes_text = (cfg.get("notes") or "").strip()
+
+    docs = Path("docs")
+    data_path = docs / "data.json"
+    previous_results = _load_previous_results(data_path, _load_last_success(LAST_SUCCESS_PATH))
+
+    # Scrape vendors
+    results = asyncio.run(_scrape_all(vendors, _new_session()))
+
+    now_dt = datetime.datetime.now(_TZ)
+    now = now_dt.strftime("%Y-%m-%d %H:%M %Z")
+    _apply_last_good_fallback(results, previous_results, now)
+
+    # Sort cards by current release date (newest first)
+    results = _sort_results_newest_first(results)
+
+    # Comments section (Google Form + Sheet)
+    comments_html = _google_comments_block(cfg)
+
+    # Write docs
+    docs.mkdir(parents=True, exist_ok=True)
+    idx = docs / "index.html"
+
+    statusbar_html = _STATUSBAR_TEMPLATE.substitute(now=html.escape(now))
+
+    # Optional notes
+    notes_html = ""
+    if notes_text:
+        notes_html = f"""
+<div class="notice" role="note" aria-label="Site notes">
+  <strong>Notes:</strong> {_escape_multiline(notes_text)}
+</div>
 """
 
-    # Write outputs
-    idx.write_text(page_html, encoding="utf-8")
-    data_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    # Final page: streamed to a temp file, cards written one by one, and only
+    # swapped in when it differs from the last build beyond the timestamp
+    fp_path = docs / ".lastbuild"
+    old_prints = _load_fingerprints(fp_path)
+    idx_tmp = idx.with_name(idx.name + ".tmp")
+    today = now_dt.date()
+    try:
+        new_prints = {
+            "index.html": _stream_page(idx_tmp, results, statusbar_html, notes_html, comments_html, today),
+            "data.json": _data_fingerprint(results, pretty=args.pretty),
+            "published": old_prints.get("published", "0"),
+        }
+        heartbeat_due = False
+        if PAGE_HEARTBEAT_HOURS > 0:
+            try:
+                heartbeat_due = now_dt.timestamp() - float(new_prints["published"]) >= PAGE_HEARTBEAT_HOURS * 3600
+            except ValueError:
+                heartbeat_due = True
+        wrote = []
+        if heartbeat_due or not idx.exists() or old_prints.get("index.html") != new_prints["index.html"]:
+            os.replace(idx_tmp, idx)
+            new_prints["published"] = str(int(now_dt.timestamp()))
+            wrote.append("docs/index.html")
+    finally:
+        # Unchanged page, or rendering failed part-way: never leave the
+        # temp file in the published folder.
+        idx_tmp.unlink(missing_ok=True)
+
+    # Write data
+    if heartbeat_due or not (data_path.exists() and old_prints.get("data.json") == new_prints["data.json"]):
+        _write_atomic(data_path, _dump_results(results, pretty=args.pretty))
+        wrote.append("docs/data.json")
+    if new_prints != old_prints:
+        _save_fingerprints(fp_path, new_prints)
+    _save_last_success(LAST_SUCCESS_PATH, results)
+
     _append_github_summary(results, now)
-    print("Done. Wrote docs/index.html and docs/data.json")
+    if wrote:
+        print(f"Done. Wrote {' and '.join(wrote)}")
+    else:
+        print("Done. No changes since the last build; docs/ left untouched")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,89 @@
+# vendors/_http.py
+# Shared HTTP plumbing for the tracker and the requests-based vendor scrapers,
+# so every session gets the same retry policy and per-host pacing.
+
+import os, sys, time, threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def env_number(name: str, default, cast=float):
+    """Numeric env override; a malformed value is reported and `default` used."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        print(f"Ignoring {name}={raw!r}: not a number; using {default}", file=sys.stderr)
+        return default
+
+class TokenBucket:
+    def __init__(self, min_interval: float = 0.3):
+        self.min_interval = min_interval
+        self.last_time = float("-inf")
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until at least `min_interval` has passed since the previous call."""
+        with self._lock:
+            wait = self.last_time + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_time = time.monotonic()
+
+# Minimum gap between request starts to one host, across all threads sharing a
+# session (0.6s is the gap the old serial ASUS probe loop slept).
+HOST_MIN_INTERVAL = env_number("BIOS_HOST_MIN_INTERVAL", 0.6)
+
+# Longest Retry-After we'll sleep for; urllib3 otherwise honours any value.
+RETRY_AFTER_CAP = 30.0
+
+class CappedRetry(Retry):
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, RETRY_AFTER_CAP)
+
+class _PacedAdapter(HTTPAdapter):
+    """HTTPAdapter that paces sends per host. requests-cache answers hits
+    before the adapter is reached, so only real network requests wait."""
+    def __init__(self, min_interval: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self._min_interval = min_interval
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def send(self, request, *args, **kwargs):
+        if self._min_interval > 0:
+            host = urlsplit(request.url).hostname or ""
+            with self._buckets_lock:
+                bucket = self._buckets.setdefault(host, TokenBucket(self._min_interval))
+            bucket.acquire()
+        return super().send(request, *args, **kwargs)
+
+def mount_adapter(session: requests.Session, min_interval: float = HOST_MIN_INTERVAL) -> requests.Session:
+    """Mount the shared keep-alive pool, retry policy and per-host pacing on `session`."""
+    adapter = _PacedAdapter(
+        min_interval=min_interval,
+        pool_connections=4,
+        pool_maxsize=16,
+        # Back off exponentially on throttling / server errors, honouring a
+        # capped Retry-After; the last response is returned for the vendor to
+        # report. Timeouts are not retried (a hung host fails after one timeout)
+        # and a refused connection gets a single retry.
+        max_retries=CappedRetry(
+            total=5,
+            connect=1,
+            read=0,
+            status=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
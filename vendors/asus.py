@@ -1,32 +1,64 @@
 from __future__ import annotations
-import os, re, json, sys, time, datetime as dt
+import os, re, json, sys, heapq, functools, datetime as dt
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright
+from vendors._http import env_number, mount_adapter
+
+# orjson (optional) parses the API payloads several times faster than stdlib json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 )
 
+# Boards fetched in parallel over plain HTTP, both by the tracker's per-board
+# calls and by latest_many's API/support-page phase (override: ASUS_MAX_WORKERS).
+MAX_CONCURRENT = max(1, env_number("ASUS_MAX_WORKERS", 4, int))
+
 # Accept Y/M/D with -, /, or . and normalize to YYYY-MM-DD
 _DATE_YMD = re.compile(r"\b(\d{4})[./-](\d{1,2})[./-](\d{1,2})\b")
+# "/" and "." date separators folded to "-" in a single pass
+_DATE_SEP_TRANS = str.maketrans({"/": "-", ".": "-"})
+# Already-normalized forms like "2025-07-29"
+_DATE_ISO_LOOSE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
 
 # NEW: BIOS versions on ASUS are typically numeric like 1606, 2006, 3607.
 # Require 3–5 digits exactly (filters out Intel ME like 19.0.5.1992v2_S).
 _BIOS_VER_NUMERIC = re.compile(r"^\d{3,5}$")
 _BIOS_VER_IN_TEXT = re.compile(r"\b(\d{3,5})\b")
 
+# Sent per request so a caller's shared session can serve both endpoints.
+_API_HEADERS = {
+    "User-Agent": _UA,
+    "Accept": "application/json, text/plain, */*",
+    "Referer": "https://www.asus.com/",
+    "Origin": "https://www.asus.com",
+}
+_PAGE_HEADERS = {
+    "User-Agent": _UA,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Fallback for standalone calls: one keep-alive pool reused across models
+# instead of a fresh Session (and TLS handshake) per lookup.
+_SESSION = mount_adapter(requests.Session())
+
+# " " and "/" both become "-" in the support-page slug
+_SLUG_TRANS = str.maketrans({" ": "-", "/": "-"})
+
+@functools.lru_cache(maxsize=1024)
 def _guess_support_url(model: str) -> str:
-    slug = (
-        model.strip()
-        .lower()
-        .replace(" ", "-")
-        .replace("/", "-")
-    )
+    slug = model.strip().lower().translate(_SLUG_TRANS)
     return f"https://www.asus.com/supportonly/{slug}/helpdesk_bios/"
 
 def _normalize_iso(s: str | None) -> str | None:
@@ -34,11 +66,11 @@ def _normalize_iso(s: str | None) -> str | None:
         return None
     s = str(s).strip()
     # normalize 2025/07/29 or 2025.07.29 -> 2025-07-29
-    s = s.replace("/", "-").replace(".", "-")
+    s = s.translate(_DATE_SEP_TRANS)
     m = _DATE_YMD.search(s)
     if not m:
         # also catch already-normalized forms like "2025-07-29"
-        m = re.search(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b", s)
+        m = _DATE_ISO_LOOSE.search(s)
         if not m:
             return None
     y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
@@ -48,15 +80,11 @@ def _normalize_iso(s: str | None) -> str | None:
         return None
 
 def _dedupe_keep_order(items: List[Dict[str, Any]], key=lambda x: x["version"].upper()):
-    seen = set()
-    out = []
+    # first occurrence wins; dicts keep insertion order
+    out: Dict[Any, Dict[str, Any]] = {}
     for it in items:
-        k = key(it)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(it)
-    return out
+        out.setdefault(key(it), it)
+    return list(out.values())
 
 def _pick_two_sorted(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Sort by date desc when available; undated keep original order and go last
@@ -65,12 +93,12 @@ def _pick_two_sorted(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not d:
             return (1, 0)
         try:
-            y, mo, da = map(int, d.split("-"))
-            return (0, -dt.date(y, mo, da).toordinal())
+            # dates come from _normalize_iso, so they are always YYYY-MM-DD
+            return (0, -dt.date.fromisoformat(d).toordinal())
         except Exception:
             return (1, 0)
-    items_sorted = sorted(items, key=k)
-    return items_sorted[:2]
+    # Only two are kept: nsmallest is a bounded heap, same order as sorted()[:2]
+    return heapq.nsmallest(2, items, key=k)
 
 def _save_debug_json(model: str, host: str, website: str, payload: Dict[str, Any]):
     if not os.getenv("ASUS_SAVE_JSON"):
@@ -78,15 +106,30 @@ def _save_debug_json(model: str, host: str, website: str, payload: Dict[str, Any
     dbg = Path("cache/asus-debug")
     dbg.mkdir(parents=True, exist_ok=True)
     name = f"{host}_{website}_{quote_plus(model)}.json"
-    (dbg / name).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        (dbg / name).write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        (dbg / name).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
-def _save_debug_html(model: str, html_text: str):
+def _save_debug_html(model: str, html_text: str | bytes):
     if not os.getenv("ASUS_SAVE_HTML"):
         return
     dbg = Path("cache/asus-debug")
     dbg.mkdir(parents=True, exist_ok=True)
     name = f"support_{quote_plus(model)}.html"
-    (dbg / name).write_text(html_text, encoding="utf-8")
+    if isinstance(html_text, bytes):
+        (dbg / name).write_bytes(html_text)
+    else:
+        (dbg / name).write_text(html_text, encoding="utf-8")
+
+def _json_text(obj: Any) -> str:
+    # Only scanned for a date, so the compact orjson form is just as good.
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
 
 def _looks_like_bios_version(version_raw: str) -> bool:
     """
@@ -104,8 +147,8 @@ def _short_error(error: Exception | str, limit: int = 600) -> str:
     text = str(error)
     return text if len(text) <= limit else text[:limit - 3] + "..."
 
-def _looks_blocked_html(html_text: str) -> bool:
-    text = BeautifulSoup(html_text or "", "html.parser").get_text(" ", strip=True).lower()
+def _looks_blocked_soup(soup: BeautifulSoup) -> bool:
+    text = soup.get_text(" ", strip=True).lower()
     return any(token in text for token in (
         "access denied",
         "request blocked",
@@ -114,41 +157,48 @@ def _looks_blocked_html(html_text: str) -> bool:
         "verify you are human",
     ))
 
-def _call_api(model: str) -> Tuple[List[Dict[str, Any]], str]:
+def _probe_api(session: requests.Session, model: str, host: str, website: str) -> List[Dict[str, Any]]:
+    url = f"https://{host}/support/api/product.asmx/GetPDBIOS"
+    params = {"website": website, "model": model}
+    r = session.get(url, params=params, headers=_API_HEADERS, timeout=20)
+    r.raise_for_status()
+    data = orjson.loads(r.content) if orjson is not None else json.loads(r.content)
+    _save_debug_json(model, host, website, data)
+    return _extract_versions_from_api(data)
+
+def _try_probe(session: requests.Session, model: str, host: str, website: str) -> Tuple[List[Dict[str, Any]], str | None]:
+    """(items, error) for one host/website combo; a 403 means blocked, so it raises."""
+    try:
+        items = _probe_api(session, model, host, website)
+    except Exception as e:
+        err = f"{host} {website}: {e}"
+        status_code = getattr(getattr(e, "response", None), "status_code", None)
+        if status_code == 403:
+            raise RuntimeError(err) from e
+        return [], err
+    return items, None if items else f"no items from {host} website={website}"
+
+def _call_api(model: str, session: requests.Session | None = None) -> Tuple[List[Dict[str, Any]], str]:
     """
     Try a few host/website combos. Return (items, used_url_for_card)
     """
     hosts = ["www.asus.com", "rog.asus.com"]
     websites = ["global", "us"]
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": _UA,
-        "Accept": "application/json, text/plain, */*",
-        "Referer": "https://www.asus.com/",
-        "Origin": "https://www.asus.com",
-    })
-
-    last_err = None
-    for host in hosts:
-        for website in websites:
-            url = f"https://{host}/support/api/product.asmx/GetPDBIOS"
-            params = {"website": website, "model": model}
-            try:
-                r = session.get(url, params=params, timeout=20)
-                r.raise_for_status()
-                data = r.json()
-                _save_debug_json(model, host, website, data)
-
-                items = _extract_versions_from_api(data)
-                if items:
-                    return items, _guess_support_url(model)
-                last_err = f"no items from {host} website={website}"
-            except Exception as e:
-                last_err = f"{host} {website}: {e}"
-                status_code = getattr(getattr(e, "response", None), "status_code", None)
-                if status_code == 403:
-                    raise RuntimeError(last_err) from e
-            time.sleep(0.6)
+    session = session or _SESSION
+    combos = [(host, website) for host in hosts for website in websites]
+
+    # The preferred combo answers for most boards, so it goes alone; only when
+    # it fails are the others probed together. Results are still taken in the
+    # order above, so the chosen host matches a serial run.
+    items, last_err = _try_probe(session, model, *combos[0])
+    if items:
+        return items, _guess_support_url(model)
+    rest = combos[1:]
+    with ThreadPoolExecutor(max_workers=len(rest)) as ex:
+        for items, err in ex.map(lambda combo: _try_probe(session, model, *combo), rest):
+            if items:
+                return items, _guess_support_url(model)
+            last_err = err
     raise RuntimeError(last_err or "API calls failed")
 
 def _support_urls(model: str, override_url: str | None = None):
@@ -158,28 +208,31 @@ def _support_urls(model: str, override_url: str | None = None):
             seen.add(url)
             yield url
 
-def _call_support_page(model: str, override_url: str | None = None) -> Tuple[List[Dict[str, Any]], str]:
+def _call_support_page(
+    model: str,
+    override_url: str | None = None,
+    session: requests.Session | None = None,
+) -> Tuple[List[Dict[str, Any]], str]:
     """
     Fallback for when ASUS' product API is unavailable. The support pages include
     the BIOS list as visible page text, so parse that before the Firmware section.
     """
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": _UA,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-    })
+    session = session or _SESSION
 
     last_err = None
     for url in _support_urls(model, override_url):
         try:
-            r = session.get(url, timeout=25)
+            r = session.get(url, headers=_PAGE_HEADERS, timeout=25)
             r.raise_for_status()
-            _save_debug_html(model, r.text)
-            items = _extract_versions_from_support_html(r.text)
+            # Raw bytes skip requests' decode; a charset from the Content-Type
+            # header is passed on, otherwise bs4 detects it (BOM / <meta> / sniffing)
+            body = r.content
+            declared = r.encoding if "charset=" in r.headers.get("Content-Type", "").lower() else None
+            _save_debug_html(model, body)
+            items, blocked = _scan_support_html(body, from_encoding=declared)
             if items:
                 return items, url
-            if _looks_blocked_html(r.text):
+            if blocked:
                 last_err = f"blocked by ASUS support page on {url}"
             else:
                 last_err = f"no BIOS items found on {url}"
@@ -244,10 +297,10 @@ def _call_support_page_browser(
             try:
                 html_text = _load_support_with_page(active_page, url)
                 _save_debug_html(model, html_text)
-                items = _extract_versions_from_support_html(html_text)
+                items, blocked = _scan_support_html(html_text)
                 if items:
                     return items, url
-                if _looks_blocked_html(html_text):
+                if blocked:
                     last_err = f"blocked by ASUS support page in browser on {url}"
                 else:
                     last_err = f"no BIOS items found in browser on {url}"
@@ -273,15 +326,17 @@ def _extract_versions_from_api(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     results: List[Dict[str, Any]] = []
 
-    def visit(obj: Any):
+    # Iterative pre-order walk (no recursion depth limit on deep payloads).
+    # Children are pushed in reverse so they pop in document order.
+    stack: List[Any] = [payload]
+    while stack:
+        obj = stack.pop()
         if isinstance(obj, dict):
-            if "Version" in obj and isinstance(obj.get("Version"), str):
-                version_raw = obj["Version"].strip()
-                # --- BIOS-only: require numeric-only version ---
-                if not _looks_like_bios_version(version_raw):
-                    # skip Intel ME etc.
-                    pass
-                else:
+            version_raw = obj.get("Version")
+            # --- BIOS-only: require numeric-only version (skips Intel ME etc.) ---
+            if isinstance(version_raw, str):
+                version_raw = version_raw.strip()
+                if _looks_like_bios_version(version_raw):
                     version = version_raw  # we may append (Beta version) below
                     title = (obj.get("Title") or obj.get("title") or "")
                     is_beta = "beta" in str(title).lower() or "beta" in version_raw.lower()
@@ -296,24 +351,32 @@ def _extract_versions_from_api(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
                     )
                     date_iso = _normalize_iso(str(date_raw) if date_raw is not None else "")
                     if not date_iso:
-                        date_iso = _normalize_iso(json.dumps(obj, ensure_ascii=False))
+                        date_iso = _normalize_iso(_json_text(obj))
 
                     results.append({"version": version, "date": date_iso})
 
-            # Recurse
-            for v in obj.values():
-                visit(v)
+            # only containers can hold further records
+            stack.extend(v for v in reversed(obj.values()) if isinstance(v, (dict, list)))
         elif isinstance(obj, list):
-            for v in obj:
-                visit(v)
-
-    visit(payload)
+            stack.extend(v for v in reversed(obj) if isinstance(v, (dict, list)))
 
     # de-dupe keep order
     return _dedupe_keep_order(results)
 
-def _extract_versions_from_support_html(html_text: str) -> List[Dict[str, Any]]:
-    soup = BeautifulSoup(html_text or "", "html.parser")
+def _scan_support_html(html_text: str | bytes, from_encoding: str | None = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Parse a support page once and return (BIOS items, looks_blocked). The
+    block check reuses the same tree and only runs when no items were found.
+    `from_encoding` only applies to bytes input.
+    """
+    if isinstance(html_text, bytes) and from_encoding:
+        soup = BeautifulSoup(html_text, "lxml", from_encoding=from_encoding)
+    else:
+        soup = BeautifulSoup(html_text or "", "lxml")
+    items = _extract_versions_from_support_soup(soup)
+    return items, (not items and _looks_blocked_soup(soup))
+
+def _extract_versions_from_support_soup(soup: BeautifulSoup) -> List[Dict[str, Any]]:
     lines = [line.strip() for line in soup.get_text("\n").splitlines() if line.strip()]
     results: List[Dict[str, Any]] = []
     in_bios_section = False
@@ -382,7 +445,7 @@ def _error_result(model: str, override_url: str | None, error: Exception | str)
         "error": _short_error(error),
     }
 
-def latest_two(model: str, override_url: str | None = None):
+def latest_two(model: str, override_url: str | None = None, session: requests.Session | None = None):
     """
     Returns:
       {
@@ -390,13 +453,14 @@ def latest_two(model: str, override_url: str | None = None):
         "versions": [{"version": "...", "date": "YYYY-MM-DD" | None}, ...],
         "ok": True/False, "error": <str-if-any>
       }
+    Pass `session` to reuse keep-alive connections across calls.
     """
     try:
         try:
-            items, human_url = _call_api(model)
+            items, human_url = _call_api(model, session=session)
         except Exception as api_error:
             try:
-                items, human_url = _call_support_page(model, override_url=override_url)
+                items, human_url = _call_support_page(model, override_url=override_url, session=session)
             except Exception as page_error:
                 try:
                     items, human_url = _call_support_page_browser(model, override_url=override_url)
@@ -415,24 +479,33 @@ def latest_one(model: str, override_url: str | None = None):
         res["versions"] = res["versions"][:1]
     return res
 
-def latest_many(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _latest_two_http(item: Dict[str, Any], session: requests.Session):
+    """API, then plain support page. Returns (result, None) or (None, fallback args)."""
+    model = str(item.get("model") or "").strip()
+    override_url = item.get("url")
+    try:
+        api_items, human_url = _call_api(model, session=session)
+        return _success_result(model, override_url, human_url, api_items), None
+    except Exception as api_error:
+        try:
+            page_items, human_url = _call_support_page(model, override_url=override_url, session=session)
+            return _success_result(model, override_url, human_url, page_items), None
+        except Exception as page_error:
+            return None, (model, override_url, api_error, page_error)
+
+def latest_many(items: List[Dict[str, Any]], session: requests.Session | None = None) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any] | None] = [None] * len(items)
     browser_fallbacks: List[Tuple[int, str, str | None, Exception, Exception]] = []
-
-    for index, item in enumerate(items):
-        model = str(item.get("model") or "").strip()
-        override_url = item.get("url")
-        try:
-            api_items, human_url = _call_api(model)
-            results[index] = _success_result(model, override_url, human_url, api_items)
-            continue
-        except Exception as api_error:
-            try:
-                page_items, human_url = _call_support_page(model, override_url=override_url)
-                results[index] = _success_result(model, override_url, human_url, page_items)
-                continue
-            except Exception as page_error:
-                browser_fallbacks.append((index, model, override_url, api_error, page_error))
+    session = session or _SESSION
+
+    # HTTP phase is I/O-bound, so boards run on a small pool; map() keeps input order.
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as ex:
+        outcomes = ex.map(lambda item: _latest_two_http(item, session), items)
+        for index, (result, fallback) in enumerate(outcomes):
+            if fallback is None:
+                results[index] = result
+            else:
+                browser_fallbacks.append((index, *fallback))
 
     if browser_fallbacks:
         try:
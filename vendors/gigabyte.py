@@ -4,9 +4,10 @@
 # - Parses BIOS cards/rows even when the href isn't a direct FileList zip
 # - Extracts nearest date around the version token, sorts by date then F-number
 
-import os, re, time, json, sys, datetime as dt
+import os, re, time, json, sys, heapq, datetime as dt
 from pathlib import Path
 from bs4 import BeautifulSoup
+import soupsieve as sv
 from playwright.sync_api import sync_playwright
 
 _UA = (
@@ -14,6 +15,9 @@ _UA = (
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 )
 
+# The persistent browser profile can only be opened by one browser at a time.
+MAX_CONCURRENT = 1
+
 # ---------- URL helpers ----------
 def _slug(s: str) -> str:
     return (
@@ -48,6 +52,8 @@ def _variants(url: str):
 _PAT_F = re.compile(r"\bF(?P<num>[0-9]{1,3})(?P<let>[A-Z])?\b", re.I)
 
 _DATE_YMD = re.compile(r"\b(?P<y>\d{4})[/-](?P<m>\d{2})[/-](?P<d>\d{2})\b")
+_DATE_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_UNSAFE_FNAME = re.compile(r"[^A-Za-z0-9._-]+")
 _DATE_MON = re.compile(
     r"""\b
     (?P<mon>
@@ -101,11 +107,14 @@ def _version_key(ver: str):
     let = (m.group("let") or "").upper()
     return (-num, -_LETTER_RANK.get(let, 0))
 
-def _sort_latest(items):
+def _sort_latest(items, limit: int | None = None):
     def k(e):
         d = e.get("date")
-        d_ord = -dt.date.fromisoformat(d).toordinal() if (d and re.match(r"^\d{4}-\d{2}-\d{2}$", d)) else float("inf")
+        d_ord = -dt.date.fromisoformat(d).toordinal() if (d and _DATE_ISO.match(d)) else float("inf")
         return (d_ord, _version_key(e.get("version","")))
+    if limit is not None:
+        # bounded heap; same result as sorted(...)[:limit]
+        return heapq.nsmallest(limit, items, key=k)
     return sorted(items, key=k)
 
 def _num_part(ver: str) -> int | None:
@@ -113,25 +122,31 @@ def _num_part(ver: str) -> int | None:
     return int(m.group("num")) if m else None
 
 def _filter_outliers(items):
-    nums = [n for n in (_num_part(x.get("version","")) for x in items) if n is not None]
+    # F-number computed once per item, then reused for the median and the filter
+    parts = [_num_part(x.get("version","")) for x in items]
+    nums = [n for n in parts if n is not None]
     if len(nums) < 2: return items
     nums_sorted = sorted(nums)
     median = nums_sorted[len(nums_sorted)//2]
-    filtered = [x for x in items if (_num_part(x.get("version","")) or 0) <= (median + 20)]
+    filtered = [x for x, n in zip(items, parts) if (n or 0) <= (median + 20)]
     return filtered if filtered else items
 
 # ---------- Root detection ----------
+# site shuffled anchors; try multiple (selectors compiled once at import)
+_BIOS_ROOT_CSS = ",".join([
+    "#support-dl-bios",
+    "section#support-dl-bios",
+    "[id*='support-dl-bios']",
+    "#dl", "section#dl", "[id='dl']",
+    "[data-section='dl']",
+    "[data-module='SupportDL']",
+])
+_DOWNLOADS_CSS = "a[href$='.zip'], a[href*='.zip?'], a.btn, a.button, button, a[href*='FileList']"
+_SEL_BIOS_ROOT = sv.compile(_BIOS_ROOT_CSS)
+_SEL_DOWNLOADS = sv.compile(_DOWNLOADS_CSS)
+
 def _bios_root(soup: BeautifulSoup):
-    # site shuffled anchors; try multiple
-    sel = ",".join([
-        "#support-dl-bios",
-        "section#support-dl-bios",
-        "[id*='support-dl-bios']",
-        "#dl", "section#dl", "[id='dl']",
-        "[data-section='dl']",
-        "[data-module='SupportDL']",
-    ])
-    root = soup.select_one(sel)
+    root = _SEL_BIOS_ROOT.select_one(soup)
     return root or soup
 
 def _window(txt: str, start: int, end: int, radius: int = 300) -> tuple[str,int]:
@@ -141,15 +156,13 @@ def _window(txt: str, start: int, end: int, radius: int = 300) -> tuple[str,int]
 
 # ---------- Parsing ----------
 def _parse_versions(html: str):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     root = _bios_root(soup)
     results = []
 
     # Prefer elements that have a visible "Download" for BIOS rows/cards
     # Grab anchors/buttons that either link to zip OR are "Download" controls
-    anchors = root.select(
-        "a[href$='.zip'], a[href*='.zip?'], a.btn, a.button, button, a[href*='FileList']"
-    )
+    anchors = _SEL_DOWNLOADS.select(root)
 
     for a in anchors:
         txt = (a.get_text(" ", strip=True) or "")
@@ -158,15 +171,14 @@ def _parse_versions(html: str):
         if not href and "download" not in txt.lower(): 
             continue
 
-        # Walk up to find the item/card row text (usually includes BIOS + Version + Date)
+        # Walk up to find the item/card row text (usually includes BIOS + Version + Date).
+        # An ancestor's text always contains its descendants' text, so only the
+        # topmost of the (up to) three parents needs get_text().
         block = a
-        blk_text = ""
-        for _ in range(4):
-            if block is None: break
-            candidate = block.get_text(" ", strip=True) or ""
-            if len(candidate) > len(blk_text):
-                blk_text = candidate
+        for _ in range(3):
+            if block.parent is None: break
             block = block.parent
+        blk_text = block.get_text(" ", strip=True) or ""
 
         low = blk_text.lower()
         # Require a BIOS context around the control to avoid grabbing drivers/utilities
@@ -212,15 +224,14 @@ def _parse_versions(html: str):
                     results.append({"version": m.group(0).upper(), "date": date_iso})
 
     # Deduplicate (first occurrence wins)
-    seen, uniq = set(), []
+    uniq_map = {}
     for it in results:
-        key = (it["version"].upper(), it.get("date"))
-        if key in seen: continue
-        seen.add(key); uniq.append(it)
+        uniq_map.setdefault((it["version"].upper(), it.get("date")), it)
+    uniq = list(uniq_map.values())
 
-    # Prune outliers and sort date-first
+    # Prune outliers and keep the newest two, date-first (all callers ever use)
     uniq = _filter_outliers(uniq)
-    return _sort_latest(uniq)
+    return _sort_latest(uniq, limit=2)
 
 def _is_block(html: str) -> bool:
     t = (html or "").lower()
@@ -236,7 +247,7 @@ def _save_html_if_requested(url: str, html: str):
         return
     debug_dir = Path("cache/gigabyte-debug")
     debug_dir.mkdir(parents=True, exist_ok=True)
-    fname = re.sub(r"[^A-Za-z0-9._-]+", "_", url)[:120] + ".html"
+    fname = _UNSAFE_FNAME.sub("_", url)[:120] + ".html"
     (debug_dir / fname).write_text(html, encoding="utf-8")
 
 def _open_context(playwright, headful: bool):
@@ -275,6 +286,34 @@ def _close_context(ctx, browser):
     except Exception:
         pass
 
+# Ready once the BIOS section holds two rows _parse_versions would accept
+# (Current + Previous): a download control whose row (up to three parents up)
+# mentions BIOS/UEFI and carries both an F-version and a date. A single row
+# also counts once the row count has held steady for 500ms, for boards that
+# only list one BIOS.
+_BIOS_READY_JS = r"""([rootCss, downloadsCss]) => {
+    const root = document.querySelector(rootCss);
+    const versions = new Set();
+    if (root) {
+        for (const a of root.querySelectorAll(downloadsCss)) {
+            let block = a;
+            for (let i = 0; i < 3 && block.parentElement; i++) block = block.parentElement;
+            const t = block.innerText || "";
+            if (!/bios|uefi/i.test(t)) continue;
+            if (!/\b\d{4}[\/-]\d{2}[\/-]\d{2}\b|\b[A-Z][a-z]{2,8}\.? \d{1,2}, ?\d{4}\b/.test(t)) continue;
+            const m = (a.getAttribute("href") || "").match(/\bF\d{1,3}[A-Z]?\b/) || t.match(/\bF\d{1,3}[A-Z]?\b/);
+            if (m) versions.add(m[0]);
+        }
+    }
+    if (versions.size >= 2) return true;
+    const now = performance.now(), seen = window.__biosRows;
+    if (!seen || seen.n !== versions.size) {
+        window.__biosRows = {n: versions.size, since: now};
+        return false;
+    }
+    return versions.size > 0 && now - seen.since >= 500;
+}"""
+
 def _fetch_with_page(page, url: str):
     timeout_ms = int(os.getenv("GIGABYTE_TIMEOUT_MS", "30000"))
     page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
@@ -304,7 +343,12 @@ def _fetch_with_page(page, url: str):
     if not tried:
         page.mouse.wheel(0, 1200)
 
-    page.wait_for_timeout(1800)
+    # Stop waiting once the Current and Previous BIOS rows have rendered (or a
+    # lone row has stopped changing); never longer than the old fixed 1.8s.
+    try:
+        page.wait_for_function(_BIOS_READY_JS, arg=[_BIOS_ROOT_CSS, _DOWNLOADS_CSS], polling=100, timeout=1800)
+    except Exception:
+        pass
     html = page.content()
     _save_html_if_requested(url, html)
     return html
@@ -317,6 +361,12 @@ def _fetch_with_playwright(url: str, headful: bool):
         finally:
             _close_context(ctx, browser)
 
+def _success_result(model: str, url: str, items) -> dict:
+    return {"vendor":"GIGABYTE","model":model,"url":url,"versions":items[:2],"ok":True}
+
+def _error_result(model: str, url: str, error: str) -> dict:
+    return {"vendor":"GIGABYTE","model":model,"url":url,"versions":[], "ok":False, "error": error[:200]}
+
 def _latest_two_with_fetchers(model: str, override_url: str = None, *, fetch_headless=None, fetch_headful=None):
     urls = [override_url] if override_url else list(_candidates(model))
     force_headful = bool(os.getenv("GIGABYTE_FORCE_HEADFUL"))
@@ -330,7 +380,7 @@ def _latest_two_with_fetchers(model: str, override_url: str = None, *, fetch_hea
                     if _is_block(html): raise RuntimeError("block-page(headless)")
                     items = _parse_versions(html)
                     if items:
-                        return {"vendor":"GIGABYTE","model":model,"url":url,"versions":items[:2],"ok":True}
+                        return _success_result(model, url, items)
                 except Exception as e:
                     last_err = f"headless:{e}"
 
@@ -339,14 +389,11 @@ def _latest_two_with_fetchers(model: str, override_url: str = None, *, fetch_hea
                 if _is_block(html): raise RuntimeError("block-page(headful)")
                 items = _parse_versions(html)
                 if items:
-                    return {"vendor":"GIGABYTE","model":model,"url":url,"versions":items[:2],"ok":True}
+                    return _success_result(model, url, items)
             except Exception as e:
                 last_err = f"headful:{e}"
 
-    return {
-        "vendor":"GIGABYTE","model":model,"url":urls[0] if urls else "",
-        "versions":[], "ok":False, "error": (last_err or "fetch/parse failed")[:200]
-    }
+    return _error_result(model, urls[0] if urls else "", last_err or "fetch/parse failed")
 
 # ---------- Public API ----------
 def latest_two(model: str, override_url: str = None):
@@ -393,10 +440,7 @@ def latest_many(items):
                         fetch_headful=fetch_headful,
                     ))
                 except Exception as e:
-                    results.append({
-                        "vendor":"GIGABYTE","model":model,"url":override_url or "",
-                        "versions":[], "ok":False, "error": str(e)[:200]
-                    })
+                    results.append(_error_result(model, override_url or "", str(e)))
         finally:
             if headless_ctx:
                 _close_context(headless_ctx, headless_browser)
@@ -1,11 +1,13 @@
 from __future__ import annotations
+import heapq
 import os
 import re
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from urllib.parse import urlparse, urlunparse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+import soupsieve as sv
 from playwright.sync_api import sync_playwright
 
 _UA = (
@@ -13,6 +15,9 @@ _UA = (
     "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
 )
 
+# Boards the tracker may fetch in parallel on per-board calls (one browser each).
+MAX_CONCURRENT = 2
+
 # ---------- patterns ----------
 # Dates like: 2025-08-18 / 2025/08/18 / 2025.08.18
 DATE_RX = re.compile(r"\b(\d{4})[./-](\d{2})[./-](\d{2})\b")
@@ -25,6 +30,15 @@ DATE_RX = re.compile(r"\b(\d{4})[./-](\d{2})[./-](\d{2})\b")
 #   "7E25vAA1  (Beta test build)"  -> 7E25vAA1
 VERSION_BASE_RX = re.compile(r"\b([A-Za-z0-9]+v[A-Za-z0-9.]+)\b", re.I)
 
+# Characters not allowed in debug-dump file names
+SLUG_UNSAFE_RX = re.compile(r"[^A-Za-z0-9_-]+")
+
+# Spec grid sections holding the BIOS rows (compiled once)
+SPEC_SEL = sv.compile("section.spec, .spec")
+# Build only the .spec subtrees when parsing; the rest of the page is never read.
+# Matched as a class token so multi-class elements like "spec wide" still count.
+SPEC_ONLY = SoupStrainer(class_=re.compile(r"(?:^|\s)spec(?:\s|$)"))
+
 def _norm_date(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
@@ -68,10 +82,10 @@ def _guess_url_from_model(model: str) -> Optional[str]:
     return f"https://www.msi.com/Motherboard/{slug}/support#bios" if slug else None
 
 def _slugify_name(model: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_-]+", "-", (model or "msi-board")).strip("-_") or "msi-board"
+    return SLUG_UNSAFE_RX.sub("-", (model or "msi-board")).strip("-_") or "msi-board"
 
 def _is_unusable_page(html_text: str) -> bool:
-    text = BeautifulSoup(html_text or "", "html.parser").get_text(" ", strip=True).lower()
+    text = BeautifulSoup(html_text or "", "lxml").get_text(" ", strip=True).lower()
     return (
         "404 not found" in text
         or "the page you requested no longer exists" in text
@@ -176,23 +190,35 @@ def _fetch_html(url: str, timeout_ms: int = 50000) -> str:
             browser.close()
 
 # ---------- parsing ----------
-def _parse_span_lookahead(soup: BeautifulSoup) -> List[Dict[str, Optional[str]]]:
+def _span_text(span) -> str:
+    # Most spec spans hold a single text node; skip get_text()'s descendant walk.
+    # (Comments are also NavigableStrings, so check the exact type.)
+    s = span.string
+    if type(s) is NavigableString:
+        return s.strip()
+    return span.get_text(strip=True)
+
+def _spec_span_texts(soup: BeautifulSoup) -> List[List[str]]:
+    """Stripped span texts per spec section, extracted once and shared by both parsers."""
+    sections: List[List[str]] = []
+    for sec in SPEC_SEL.select(soup):
+        texts = [_span_text(s) for s in sec.find_all("span")]
+        if texts:
+            sections.append(texts)
+    return sections
+
+def _parse_span_lookahead(sections: List[List[str]]) -> List[Dict[str, Optional[str]]]:
     """
     Primary: within each section.spec, find a '...BIOS' title span and scan forward for
     the next Version (base extracted) and Date. We keep Beta rows but only print base version.
     """
     out: List[Dict[str, Optional[str]]] = []
-    for sec in soup.select("section.spec, .spec"):
-        spans = sec.find_all("span")
-        if not spans:
-            continue
-        texts = [s.get_text(strip=True) for s in spans]
-
+    for texts in sections:
         bios_idxs = [i for i, t in enumerate(texts) if "bios" in t.lower()]
         for i in bios_idxs:
             ver = None
             dt  = None
-            for j in range(i + 1, min(i + 12, len(spans))):
+            for j in range(i + 1, min(i + 12, len(texts))):
                 tj = texts[j]
                 if ver is None:
                     base = _extract_base_version(tj)
@@ -217,18 +243,13 @@ def _parse_span_lookahead(soup: BeautifulSoup) -> List[Dict[str, Optional[str]]]
         uniq.append(r)
     return uniq
 
-def _parse_grid_sections(soup: BeautifulSoup) -> List[Dict[str, Optional[str]]]:
+def _parse_grid_sections(sections: List[List[str]]) -> List[Dict[str, Optional[str]]]:
     """
     Secondary: strict grid (Title|Version|Release Date|File Size) for clean pages,
     extracting the base version from the Version cell.
     """
     out: List[Dict[str, Optional[str]]] = []
-    for sec in soup.select("section.spec, .spec"):
-        spans = sec.find_all("span")
-        if not spans:
-            continue
-        texts = [s.get_text(strip=True) for s in spans]
-
+    for texts in sections:
         # find a proper header row
         start = -1
         for i in range(0, len(texts) - 3):
@@ -254,40 +275,47 @@ def _parse_grid_sections(soup: BeautifulSoup) -> List[Dict[str, Optional[str]]]:
     return out
 
 def _parse_bios_rows(html_text: str) -> List[Dict[str, Optional[str]]]:
-    soup = BeautifulSoup(html_text or "", "html.parser")
+    soup = BeautifulSoup(html_text or "", "lxml", parse_only=SPEC_ONLY)
+    sections = _spec_span_texts(soup)
     # Prefer robust span lookahead (better on busy pages)
-    rows = _parse_span_lookahead(soup)
+    rows = _parse_span_lookahead(sections)
     if rows:
         return rows
     # Fall back to strict grid
-    return _parse_grid_sections(soup)
+    return _parse_grid_sections(sections)
+
+def _error_result(model_name: str, url: str, error: str) -> Dict[str, Any]:
+    return {
+        "vendor": "MSI",
+        "model": model_name,
+        "url": url,
+        "ok": False,
+        "versions": [],
+        "error": error[:200],
+    }
 
 def _result_from_html(model_name: str, final_url: str, html_text: str) -> Dict[str, Any]:
-    # Always dump a debug snapshot locally for tuning
+    # Always dump a debug snapshot locally for tuning (skipped when unchanged)
     try:
         Path("cache/msi-debug").mkdir(parents=True, exist_ok=True)
-        Path(f"cache/msi-debug/{_slugify_name(model_name)}.html").write_text(html_text, encoding="utf-8")
+        dump = Path(f"cache/msi-debug/{_slugify_name(model_name)}.html")
+        if not (dump.exists() and dump.read_text(encoding="utf-8") == html_text):
+            dump.write_text(html_text, encoding="utf-8")
     except Exception:
         pass
 
     rows = _parse_bios_rows(html_text)
     if not rows:
-        return {
-            "vendor": "MSI",
-            "model": model_name,
-            "url": final_url,
-            "ok": False,
-            "versions": [],
-            "error": "parse:no-versions",
-        }
+        return _error_result(model_name, final_url, "parse:no-versions")
 
     # Newest first by date if present; otherwise keep order
     def key(r):
         d = r.get("date")
         return (0, d) if d else (1, "")
-    rows_sorted = sorted(rows, key=key, reverse=True)
+    # Only two are kept: nlargest matches sorted(reverse=True)[:2] without a full sort
+    rows_sorted = heapq.nlargest(2, rows, key=key)
 
-    versions = [{"version": r.get("version") or "", "date": r.get("date")} for r in rows_sorted[:2]]
+    versions = [{"version": r.get("version") or "", "date": r.get("date")} for r in rows_sorted]
 
     return {
         "vendor": "MSI",   # keep MSI so tiles show under the MSI filter
@@ -305,14 +333,7 @@ def latest_two(model_name: str, override_url: Optional[str] = None) -> Dict:
     """
     url0 = override_url or _guess_url_from_model(model_name)
     if not url0:
-        return {
-            "vendor": "MSI",
-            "model": model_name,
-            "url": "",
-            "ok": False,
-            "versions": [],
-            "error": "msi: override_url required",
-        }
+        return _error_result(model_name, "", "msi: override_url required")
 
     final_url = _ensure_bios_anchor(_force_https(url0))
     html_text = _fetch_html(final_url)
@@ -330,14 +351,7 @@ def latest_many(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 override_url = item.get("url")
                 url0 = override_url or _guess_url_from_model(model_name)
                 if not url0:
-                    results.append({
-                        "vendor": "MSI",
-                        "model": model_name,
-                        "url": "",
-                        "ok": False,
-                        "versions": [],
-                        "error": "msi: override_url required",
-                    })
+                    results.append(_error_result(model_name, "", "msi: override_url required"))
                     continue
 
                 final_url = _ensure_bios_anchor(_force_https(str(url0)))
@@ -345,14 +359,7 @@ def latest_many(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                     html_text = _fetch_html_with_page(page, final_url)
                     results.append(_result_from_html(model_name, final_url, html_text))
                 except Exception as e:
-                    results.append({
-                        "vendor": "MSI",
-                        "model": model_name,
-                        "url": final_url,
-                        "ok": False,
-                        "versions": [],
-                        "error": str(e)[:200],
-                    })
+                    results.append(_error_result(model_name, final_url, str(e)))
         finally:
             ctx.close()
             browser.close()